@@ -1,15 +1,110 @@
 """Lightweight MCP server for date, time, and day of week."""
 
-from calendar import monthrange
-from datetime import datetime, timezone
+# Performance note for contributors: these tools are bound by string formatting and
+# tzdata lookups, not numeric loops. Numba falls back to object mode on str, datetime
+# and ZoneInfo code (slower than plain CPython, plus JIT compile latency at startup),
+# and Cython gains little here, so neither is used. Prefer caching and avoiding
+# repeated formatting work instead.
+
+import re
+import time
+from calendar import isleap, monthrange
+from datetime import datetime, timezone, tzinfo
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
 from fastmcp import FastMCP
 
 mcp = FastMCP("mcp-datetimeday")
 
+_DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+_MONTHS = (
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+)
+
+# Days before the first of each month in a common year
+_MONTH_DOY_OFFSET = (0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+# Calendar quarter for each month
+_QUARTER = (1, 1, 1, 2, 2, 2, 3, 3, 3, 4, 4, 4)
+
+# (size in seconds, singular, plural) for relative_time, largest first
+_UNITS = (
+    (365 * 86400, "year", "years"),
+    (30 * 86400, "month", "months"),
+    (7 * 86400, "week", "weeks"),
+    (86400, "day", "days"),
+    (3600, "hour", "hours"),
+    (60, "minute", "minutes"),
+    (1, "second", "seconds"),
+)
+
+
+# Accepted input formats, with the zero-padded spellings fromisoformat can take directly
+_DATE_FORMATS = ("%Y-%m-%d",)
+_DATETIME_FORMATS = ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S")
+_DATE_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}")
+_DATETIME_RE = re.compile(r"[0-9]{4}-[0-9]{2}-[0-9]{2}(?:[T ][0-9]{2}:[0-9]{2}:[0-9]{2})?")
+
+
+@lru_cache(maxsize=256)
+def _get_zone(tz: str) -> tzinfo:
+    """Return the tzinfo for an IANA name, reusing previously loaded zones."""
+    return timezone.utc if tz == "UTC" else ZoneInfo(tz)
+
+
+def _utc_off(dt: datetime) -> str:
+    """Format the UTC offset like strftime("%z"), e.g. "+0530"."""
+    off = dt.utcoffset()
+    if off is None:
+        return ""
+    secs = off.days * 86400 + off.seconds
+    sign = "+" if secs >= 0 else "-"
+    hours, rem = divmod(abs(secs), 3600)
+    minutes, secs = divmod(rem, 60)
+    if secs:
+        return f"{sign}{hours:02d}{minutes:02d}{secs:02d}"
+    return f"{sign}{hours:02d}{minutes:02d}"
+
+
+def _human(dt: datetime) -> str:
+    """Format like strftime("%A, %B %d, %Y at %I:%M %p") with fixed English names."""
+    hour = (dt.hour - 1) % 12 + 1
+    meridiem = "AM" if dt.hour < 12 else "PM"
+    return (
+        f"{_DAYS[dt.weekday()]}, {_MONTHS[dt.month - 1]} {dt.day:02d}, {dt.year} "
+        f"at {hour:02d}:{dt.minute:02d} {meridiem}"
+    )
+
+
+def _parse(value: str, date_only: bool = False) -> datetime | None:
+    """Parse a naive date (or datetime unless date_only), returning None on failure."""
+    pattern, formats = (_DATE_RE, _DATE_FORMATS) if date_only else (_DATETIME_RE, _DATETIME_FORMATS)
+    if pattern.fullmatch(value):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    # Non-padded or out-of-range input: defer to strptime for its exact grammar
+    for fmt in formats:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    return None
+
 
-@mcp.tool()
 def get_datetime(
     tz: str | None = None,
     format: str | None = None,
@@ -22,18 +117,21 @@ def get_datetime(
         format: Output format - "iso8601", "unix", "human", or None for full response.
 
     Returns:
-        Formatted datetime with day of week always included.
+        Formatted datetime with day of week always included. The unix timestamp is
+        POSIX seconds and does not depend on tz.
     """
+    ts = time.time()
     if tz:
         try:
-            zone = ZoneInfo(tz) if tz != "UTC" else timezone.utc
-            now = datetime.now(zone)
+            now = datetime.fromtimestamp(ts, _get_zone(tz))
         except Exception:
             return {"error": f"Invalid timezone: {tz}"}
     else:
-        now = datetime.now().astimezone()
+        # Not cached at import: astimezone() yields a fixed offset, which would go
+        # stale across a DST change in a long-running server.
+        now = datetime.fromtimestamp(ts, timezone.utc).astimezone()
 
-    day_of_week = now.strftime("%A")
+    day_of_week = _DAYS[now.weekday()]
 
     if format == "iso8601":
         return {"day_of_week": day_of_week, "iso8601": now.isoformat()}
@@ -42,23 +140,22 @@ def get_datetime(
     elif format == "human":
         return {
             "day_of_week": day_of_week,
-            "human_readable": now.strftime("%A, %B %d, %Y at %I:%M %p"),
+            "human_readable": _human(now),
         }
 
     # Default: full response
     return {
         "day_of_week": day_of_week,
-        "date": now.strftime("%Y-%m-%d"),
-        "time": now.strftime("%H:%M:%S"),
-        "timezone": str(now.tzinfo),
-        "utc_offset": now.strftime("%z"),
+        "date": f"{now.year:04d}-{now.month:02d}-{now.day:02d}",
+        "time": f"{now.hour:02d}:{now.minute:02d}:{now.second:02d}",
+        "timezone": tz or str(now.tzinfo),
+        "utc_offset": _utc_off(now),
         "iso8601": now.isoformat(),
         "unix_timestamp": int(now.timestamp()),
-        "human_readable": now.strftime("%A, %B %d, %Y at %I:%M %p"),
+        "human_readable": _human(now),
     }
 
 
-@mcp.tool()
 def relative_time(date_str: str, reference: str | None = None) -> dict:
     """
     Get relative time description between two dates.
@@ -70,84 +167,48 @@ def relative_time(date_str: str, reference: str | None = None) -> dict:
     Returns:
         Relative time description (e.g., "3 days ago", "in 2 weeks").
     """
-    formats = ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"]
-
-    target = None
-    for fmt in formats:
-        try:
-            target = datetime.strptime(date_str, fmt)
-            break
-        except ValueError:
-            continue
-
+    target = _parse(date_str)
     if not target:
         return {"error": f"Invalid date format: {date_str}. Use YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS."}
 
     if reference:
-        ref = None
-        for fmt in formats:
-            try:
-                ref = datetime.strptime(reference, fmt)
-                break
-            except ValueError:
-                continue
+        ref = _parse(reference)
         if not ref:
             return {"error": f"Invalid reference date format: {reference}"}
     else:
         ref = datetime.now()
 
     delta = target - ref
-    total_seconds = delta.total_seconds()
+    # Whole seconds truncated toward zero, without going through float
+    total_seconds = delta.days * 86400 + delta.seconds
+    if total_seconds < 0 and delta.microseconds:
+        total_seconds += 1
     is_future = total_seconds > 0
-    abs_seconds = abs(total_seconds)
-
-    # Calculate components
-    days = int(abs_seconds // 86400)
-    hours = int((abs_seconds % 86400) // 3600)
-    minutes = int((abs_seconds % 3600) // 60)
-    seconds = int(abs_seconds % 60)
-
-    # Build description
-    if days >= 365:
-        years = days // 365
-        unit = "year" if years == 1 else "years"
-        desc = f"{years} {unit}"
-    elif days >= 30:
-        months = days // 30
-        unit = "month" if months == 1 else "months"
-        desc = f"{months} {unit}"
-    elif days >= 7:
-        weeks = days // 7
-        unit = "week" if weeks == 1 else "weeks"
-        desc = f"{weeks} {unit}"
-    elif days > 0:
-        unit = "day" if days == 1 else "days"
-        desc = f"{days} {unit}"
-    elif hours > 0:
-        unit = "hour" if hours == 1 else "hours"
-        desc = f"{hours} {unit}"
-    elif minutes > 0:
-        unit = "minute" if minutes == 1 else "minutes"
-        desc = f"{minutes} {unit}"
+    abs_seconds = -total_seconds if total_seconds < 0 else total_seconds
+
+    # Largest unit that fits wins
+    for size, singular, plural in _UNITS:
+        if abs_seconds >= size:
+            count = abs_seconds // size
+            desc = f"{count} {singular if count == 1 else plural}"
+            break
     else:
-        unit = "second" if seconds == 1 else "seconds"
-        desc = f"{seconds} {unit}"
+        desc = "0 seconds"
 
     relative = f"in {desc}" if is_future else f"{desc} ago"
-    if abs_seconds < 1:
+    if not abs_seconds:
         relative = "now"
 
     return {
         "target": date_str,
-        "target_day_of_week": target.strftime("%A"),
+        "target_day_of_week": _DAYS[target.weekday()],
         "reference": reference or "now",
         "relative": relative,
         "days_difference": delta.days,
-        "total_seconds": int(total_seconds),
+        "total_seconds": total_seconds,
     }
 
 
-@mcp.tool()
 def days_in_month(year: int | None = None, month: int | None = None) -> dict:
     """
     Get the number of days in a month.
@@ -165,29 +226,29 @@ def days_in_month(year: int | None = None, month: int | None = None) -> dict:
 
     if not 1 <= month <= 12:
         return {"error": f"Invalid month: {month}. Must be 1-12."}
+    if not 1 <= year <= 9999:
+        return {"error": f"Invalid year: {year}. Must be 1-9999."}
 
     first_weekday, num_days = monthrange(year, month)
-    first_day = datetime(year, month, 1)
-    last_day = datetime(year, month, num_days)
+    last_weekday = (first_weekday + num_days - 1) % 7
 
     return {
         "year": year,
         "month": month,
-        "month_name": first_day.strftime("%B"),
+        "month_name": _MONTHS[month - 1],
         "days_in_month": num_days,
         "first_day": {
-            "date": first_day.strftime("%Y-%m-%d"),
-            "day_of_week": first_day.strftime("%A"),
+            "date": f"{year:04d}-{month:02d}-01",
+            "day_of_week": _DAYS[first_weekday],
         },
         "last_day": {
-            "date": last_day.strftime("%Y-%m-%d"),
-            "day_of_week": last_day.strftime("%A"),
+            "date": f"{year:04d}-{month:02d}-{num_days:02d}",
+            "day_of_week": _DAYS[last_weekday],
         },
-        "is_leap_year": year % 4 == 0 and (year % 100 != 0 or year % 400 == 0),
+        "is_leap_year": isleap(year),
     }
 
 
-@mcp.tool()
 def convert_time(
     time_str: str,
     from_tz: str,
@@ -204,45 +265,35 @@ def convert_time(
     Returns:
         Converted time with day of week for both timezones.
     """
-    formats = ["%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d"]
-
-    dt = None
-    for fmt in formats:
-        try:
-            dt = datetime.strptime(time_str, fmt)
-            break
-        except ValueError:
-            continue
-
+    dt = _parse(time_str)
     if not dt:
         return {"error": f"Invalid time format: {time_str}"}
 
     try:
-        source_zone = ZoneInfo(from_tz) if from_tz != "UTC" else timezone.utc
-        target_zone = ZoneInfo(to_tz) if to_tz != "UTC" else timezone.utc
+        source_zone = _get_zone(from_tz)
+        target_zone = _get_zone(to_tz)
     except Exception as e:
         return {"error": f"Invalid timezone: {e}"}
 
     source_dt = dt.replace(tzinfo=source_zone)
-    target_dt = source_dt.astimezone(target_zone)
+    target_dt = source_dt if from_tz == to_tz else source_dt.astimezone(target_zone)
 
     return {
         "from": {
-            "day_of_week": source_dt.strftime("%A"),
+            "day_of_week": _DAYS[source_dt.weekday()],
             "datetime": source_dt.strftime("%Y-%m-%d %H:%M:%S"),
             "timezone": from_tz,
-            "utc_offset": source_dt.strftime("%z"),
+            "utc_offset": _utc_off(source_dt),
         },
         "to": {
-            "day_of_week": target_dt.strftime("%A"),
+            "day_of_week": _DAYS[target_dt.weekday()],
             "datetime": target_dt.strftime("%Y-%m-%d %H:%M:%S"),
             "timezone": to_tz,
-            "utc_offset": target_dt.strftime("%z"),
+            "utc_offset": _utc_off(target_dt),
         },
     }
 
 
-@mcp.tool()
 def get_week_year(date_str: str | None = None) -> dict:
     """
     Get week number and ISO week of the year.
@@ -254,29 +305,38 @@ def get_week_year(date_str: str | None = None) -> dict:
         Week number, ISO week, day of year, and related info.
     """
     if date_str:
-        try:
-            dt = datetime.strptime(date_str, "%Y-%m-%d")
-        except ValueError:
+        dt = _parse(date_str, date_only=True)
+        if not dt:
             return {"error": f"Invalid date format: {date_str}. Use YYYY-MM-DD."}
     else:
         dt = datetime.now()
 
-    iso_cal = dt.isocalendar()
+    weekday = dt.weekday()
+    iso_year, iso_week, _ = dt.isocalendar()
+    leap = isleap(dt.year)
+    day_of_year = _MONTH_DOY_OFFSET[dt.month - 1] + dt.day + (leap and dt.month > 2)
 
     return {
         "date": dt.strftime("%Y-%m-%d"),
-        "day_of_week": dt.strftime("%A"),
-        "day_of_week_number": dt.isoweekday(),  # 1=Monday, 7=Sunday
-        "week_number": (dt.timetuple().tm_yday - 1) // 7 + 1,  # Simple week count
-        "iso_week": iso_cal[1],
-        "iso_year": iso_cal[0],  # ISO year (can differ from calendar year)
-        "day_of_year": dt.timetuple().tm_yday,
-        "days_remaining_in_year": (datetime(dt.year, 12, 31) - dt).days,
-        "is_weekend": dt.isoweekday() >= 6,
-        "quarter": (dt.month - 1) // 3 + 1,
+        "day_of_week": _DAYS[weekday],
+        "day_of_week_number": weekday + 1,  # 1=Monday, 7=Sunday
+        "week_number": (day_of_year - 1) // 7 + 1,  # Simple week count
+        "iso_week": iso_week,
+        "iso_year": iso_year,  # ISO year (can differ from calendar year)
+        "day_of_year": day_of_year,
+        "days_remaining_in_year": (366 if leap else 365) - day_of_year,
+        "is_weekend": weekday >= 5,
+        "quarter": _QUARTER[dt.month - 1],
     }
 
 
+# Registered in one place so the tool functions stay plain callables
+_TOOLS = (get_datetime, relative_time, days_in_month, convert_time, get_week_year)
+for _tool in _TOOLS:
+    mcp.tool()(_tool)
+del _tool
+
+
 def main():
     """Run the MCP server."""
     mcp.run()